@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 import sys
 from calendar import month_name
+from datetime import datetime
 
 # --- Project imports setup ---
 project_root = Path(__file__).resolve().parents[2]
@@ -11,7 +12,12 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from src.ui.sidebar_controls import sidebar_controls
-from src.app_state import get_weather, DEFAULT_WEATHER_VARS
+from src.app_state import (
+    get_weather,
+    get_production,
+    get_consumption,
+    DEFAULT_WEATHER_VARS,
+)
 
 
 # ==========================================================
@@ -70,23 +76,25 @@ except Exception as e:
 # ----------------------------------------------------------
 # Load PRODUCTION + CONSUMPTION
 # ----------------------------------------------------------
-prod_df = st.session_state.get("production")
-cons_df = st.session_state.get("consumption")
+# Only the selected year and the one before it (for the deltas below) are
+# used, so load just that window from MongoDB
+data_start = datetime(int(year) - 1, 1, 1)
+data_end = datetime(int(year) + 1, 1, 1)
+
+prod_df = get_production(data_start, data_end)
+cons_df = get_consumption(data_start, data_end)
 
 if prod_df is None or prod_df.empty:
-    st.error("Production data not available — check initialization.")
+    st.error(f"No production data for {data_start.year}–{year}.")
     st.stop()
 
 if cons_df is None or cons_df.empty:
-    st.error("Consumption data not available — check initialization.")
+    st.error(f"No consumption data for {data_start.year}–{year}.")
     st.stop()
 
 # Normalize
-prod_df = prod_df.copy()
-cons_df = cons_df.copy()
-
-prod_df["starttime"] = pd.to_datetime(prod_df["starttime"])
-cons_df["starttime"] = pd.to_datetime(cons_df["starttime"])
+prod_df = prod_df.copy(deep=False)
+cons_df = cons_df.copy(deep=False)
 
 for df in (prod_df, cons_df):
     if "month" not in df.columns:
@@ -237,9 +245,9 @@ with col_right:
 
 st.subheader("Energy Balance Overview")
 
-# --- Load production / consumption ---
-prod_df = st.session_state.get("production")
-cons_df = st.session_state.get("consumption")
+# --- Load production / consumption (same cached window as above) ---
+prod_df = get_production(data_start, data_end)
+cons_df = get_consumption(data_start, data_end)
 
 if prod_df is None or prod_df.empty:
     st.error("Production data missing.")
@@ -250,10 +258,8 @@ if cons_df is None or cons_df.empty:
     st.stop()
 
 # --- Prepare data ---
-prod_df = prod_df.copy()
-cons_df = cons_df.copy()
-prod_df["starttime"] = pd.to_datetime(prod_df["starttime"])
-cons_df["starttime"] = pd.to_datetime(cons_df["starttime"])
+prod_df = prod_df.copy(deep=False)
+cons_df = cons_df.copy(deep=False)
 
 prod_df["month"] = prod_df["starttime"].dt.month
 cons_df["month"] = cons_df["starttime"].dt.month
@@ -393,15 +399,17 @@ with summary_cols[0]:
 
 with summary_cols[1]:
     st.write("### Energy Data")
+    # prod_df / cons_df hold only the window loaded above, not the full tables
+    st.caption(f"Loaded window: {data_start.year}–{year}, all price areas")
     st.write(
-        f"Production range: {prod_df['starttime'].min().date()} → {prod_df['starttime'].max().date()}"
+        f"Production range in window: {prod_df['starttime'].min().date()} → {prod_df['starttime'].max().date()}"
     )
-    st.write("Production records:", len(prod_df))
+    st.write("Production records in window:", len(prod_df))
     st.write(
-        f"Consumption range: {cons_df['starttime'].min().date()} → {cons_df['starttime'].max().date()}"
+        f"Consumption range in window: {cons_df['starttime'].min().date()} → {cons_df['starttime'].max().date()}"
     )
-    st.write("Consumption records:", len(cons_df))
+    st.write("Consumption records in window:", len(cons_df))
 
 st.caption(
-    "Tip: Use the sidebar to change year, area, or month — everything updates automatically."
+    "Tip: Use the sidebar to change year, area, or month, then click Apply to update the page."
 )
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 from pathlib import Path
 import sys
@@ -10,6 +9,7 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from src.ui.sidebar_controls import sidebar_controls
+from src.app_state import get_production, get_consumption
 
 # --- Shared sidebar state (from all pages) ---
 price_area, city, lat, lon, year, month = sidebar_controls()
@@ -18,15 +18,14 @@ price_area, city, lat, lon, year, month = sidebar_controls()
 #                           PRODUCTION
 # ------------------------------------------------------------
 
-df_prod = st.session_state.get("production")
+df_prod = get_production()
 if df_prod is None or df_prod.empty:
     st.error(
         "Production data not available. Please check that the app has been initialized."
     )
     st.stop()
 
-df_prod = df_prod.copy()
-df_prod["starttime"] = pd.to_datetime(df_prod["starttime"])
+df_prod = df_prod.copy(deep=False)
 
 # Map 'group' to 'productiongroup' if older data format
 if "productiongroup" not in df_prod.columns and "group" in df_prod.columns:
@@ -176,15 +175,14 @@ with st.expander("About the data (Production)"):
 st.divider()
 st.header("Consumption Overview")
 
-df_cons = st.session_state.get("consumption")
+df_cons = get_consumption()
 if df_cons is None or df_cons.empty:
     st.error(
         "Consumption data not available. Please check that the app has been initialized."
     )
     st.stop()
 
-df_cons = df_cons.copy()
-df_cons["starttime"] = pd.to_datetime(df_cons["starttime"])
+df_cons = df_cons.copy(deep=False)
 
 if "consumptiongroup" not in df_cons.columns and "group" in df_cons.columns:
     df_cons["consumptiongroup"] = df_cons["group"]
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 import sys
 
@@ -9,6 +8,7 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from src.ui.sidebar_controls import sidebar_controls
+from src.app_state import get_production, get_consumption
 from src.analysis.plots import plot_stl_decomposition, plot_spectrogram
 
 
@@ -32,11 +32,11 @@ with st.sidebar:
 # LOAD DATASET BASED ON ENERGY TYPE
 # =========================================================
 if energy_type == "Production":
-    df = st.session_state.get("production")
+    df = get_production()
     group_col = "productiongroup"
     page_title = "Production Analyses (Elhub)"
 else:
-    df = st.session_state.get("consumption")
+    df = get_consumption()
     group_col = "consumptiongroup"
     page_title = "Consumption Analyses (Elhub)"
 
@@ -55,8 +55,7 @@ if df is None or df.empty:
     st.error(f"{energy_type} data not available. Please initialize the app.")
     st.stop()
 
-df = df.copy()
-df["starttime"] = pd.to_datetime(df["starttime"])
+df = df.copy(deep=False)
 
 # Backwards compatibility with "group"
 if group_col not in df.columns and "group" in df.columns:
@@ -126,6 +125,12 @@ with tab1:
             help="Observations per seasonal period. Must be odd and < trend.",
         )
 
+    robust = st.checkbox(
+        "Robust fitting",
+        value=False,
+        help="Down-weights outliers. Slower; only needed for outlier-heavy series.",
+    )
+
     subset = (
         filtered[filtered[group_col] == energy_group]
         .sort_values("starttime")
@@ -135,7 +140,7 @@ with tab1:
     if subset.empty:
         st.warning("No data found for this selection.")
     else:
-        fig = plot_stl_decomposition(subset, seasonal, trend)
+        fig = plot_stl_decomposition(subset, seasonal, trend, robust=robust)
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("#### Summary Statistics")
@@ -14,7 +14,13 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from src.app_state import get_weather, PRICEAREAS, DEFAULT_WEATHER_VARS
+from src.app_state import (
+    get_weather,
+    get_production,
+    get_consumption,
+    PRICEAREAS,
+    DEFAULT_WEATHER_VARS,
+)
 from src.forecast.sarimax_utils import (
     prepare_data,
     fit_sarimax,
@@ -33,23 +39,23 @@ st.title("SARIMAX Energy Forecasting")
 # ---------------------------------------------------------
 data_source = st.radio("Select dataset", ["Production", "Consumption"], horizontal=True)
 
-# Load from session_state
+# Load cached silver data
 if data_source == "Production":
-    df = st.session_state.get("production")
+    df = get_production()
     if df is None or df.empty:
         st.error(
             "Production data not available. Please check that the app has been initialized."
         )
         st.stop()
 else:
-    df = st.session_state.get("consumption")
+    df = get_consumption()
     if df is None or df.empty:
         st.error(
             "Consumption data not available. Please check that the app has been initialized."
         )
         st.stop()
 
-df = df.copy()
+df = df.copy(deep=False)
 
 
 # ---------------------------------------------------------
@@ -188,20 +194,17 @@ if st.button("Run Forecast"):
     exog_cols = weather_selected  # add other exogenous if needed here
 
     st.write("Preparing data...")
-    y, X = prepare_data(df, target, str(start_date), str(end_date), exog_cols)
+    y, X, t = prepare_data(df, target, str(start_date), str(end_date), exog_cols)
 
     st.write("Fitting model...")
 
     st.subheader("Forecast Results")
     model = fit_sarimax(y, X, order, seasonal_order)
 
-    # Build future exogenous inputs
+    # Build future exogenous inputs (last observed values held constant)
     if exog_cols:
-        future_index = pd.date_range(
-            start=end_date, periods=forecast_horizon + 1, freq="h"
-        )[1:]
-        last_vals = df[exog_cols].iloc[-1]
-        X_future = pd.DataFrame([last_vals] * forecast_horizon, index=future_index)
+        last_vals = df[exog_cols].iloc[-1].to_numpy(dtype=np.float64)
+        X_future = np.tile(last_vals, (forecast_horizon, 1))
     else:
         X_future = None
 
@@ -210,18 +213,21 @@ if st.button("Run Forecast"):
         model_params, steps=forecast_horizon, X_future=X_future
     )
 
+    # Timestamps are only re-attached here, for plotting
+    future_t = pd.date_range(t[-1], periods=forecast_horizon + 1, freq="h")[1:]
+
     # ---------------------------------------------------------
     # PLOT
     # ---------------------------------------------------------
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(x=y.index, y=y, name="Historical"))
+    fig.add_trace(go.Scatter(x=t, y=y, name="Historical"))
 
     # One-step ahead
-    insample = model.get_prediction(start=y.index[0], end=y.index[-1], dynamic=False)
+    insample = model.get_prediction(start=0, end=len(y) - 1, dynamic=False)
     fig.add_trace(
         go.Scatter(
-            x=insample.predicted_mean.index,
+            x=t,
             y=insample.predicted_mean,
             name="One-step ahead",
             line=dict(dash="dash"),
@@ -229,13 +235,13 @@ if st.button("Run Forecast"):
     )
 
     # Dynamic forecast
-    fig.add_trace(go.Scatter(x=forecast.index, y=forecast, name="Forecast"))
+    fig.add_trace(go.Scatter(x=future_t, y=forecast, name="Forecast"))
 
     # Confidence interval
     fig.add_trace(
         go.Scatter(
-            x=forecast.index.tolist() + forecast.index[::-1].tolist(),
-            y=upper.tolist() + lower[::-1].tolist(),
+            x=np.concatenate([future_t, future_t[::-1]]),
+            y=np.concatenate([upper, lower[::-1]]),
             fill="toself",
             fillcolor="rgba(0,150,255,0.2)",
             line=dict(color="rgba(255,255,255,0)"),
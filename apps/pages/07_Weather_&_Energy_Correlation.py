@@ -12,7 +12,13 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from src.app_state import get_weather, PRICEAREAS, DEFAULT_WEATHER_VARS
+from src.app_state import (
+    get_weather,
+    get_production,
+    get_consumption,
+    PRICEAREAS,
+    DEFAULT_WEATHER_VARS,
+)
 
 
 # ---------------------------------------------------------
@@ -38,15 +44,14 @@ Features:
 # Caching wrappers
 # ---------------------------------------------------------
 def load_energy_cached(energy_type):
-    """Get energy data from session state."""
-    key = "production" if energy_type == "Production" else "consumption"
-    df = st.session_state.get(key)
+    """Get energy data from the cached silver loaders."""
+    df = get_production() if energy_type == "Production" else get_consumption()
     if df is None or df.empty:
         st.error(
             f"{energy_type} data not available. Please check that the app has been initialized."
         )
         st.stop()
-    return df.copy()
+    return df.copy(deep=False)
 
 
 @st.cache_data(ttl=1800)
@@ -15,6 +15,8 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
+from src import app_state
+
 # We intentionally DO NOT import sidebar_controls here
 # to avoid drawing a price-area selector on this page.
 
@@ -37,14 +39,17 @@ def normalize_pa(code: str | None) -> str | None:
 
 
 def get_data(dfname: str) -> pd.DataFrame:
-    """Get a dataframe from session_state and fail fast if missing."""
-    df = st.session_state.get(dfname)
+    """Get a cached silver dataframe and fail fast if missing."""
+    if dfname == "production":
+        df = app_state.get_production()
+    else:
+        df = app_state.get_consumption()
     if df is None or df.empty:
         st.error(
             f"{dfname.capitalize()} data not available. Please initialize the app."
         )
         st.stop()
-    return df.copy()
+    return df.copy(deep=False)
 
 
 def get_production() -> pd.DataFrame:
@@ -118,7 +123,7 @@ with st.sidebar:
     df_groups = get_production() if data_type == "Production" else get_consumption()
 
     # Normalize pricearea column once
-    df_groups = df_groups.copy()
+    df_groups = df_groups.copy(deep=False)
     df_groups["pricearea"] = df_groups["pricearea"].apply(normalize_pa)
 
     all_groups = sorted(df_groups["group"].dropna().unique())
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from scipy.fftpack import dct, idct
+from scipy.fft import dct, idct
 from sklearn.neighbors import LocalOutlierFactor
 
 
@@ -21,32 +21,34 @@ def detect_temperature_outliers(df, cutoff=0.1, std_thresh=2.0):
     df = df.copy().dropna(subset=["temperature_2m"])
     df = df.sort_values("time")
 
-    temps = df["temperature_2m"].to_numpy()
+    temps = np.ascontiguousarray(df["temperature_2m"].to_numpy(), dtype=np.float64)
     n = len(temps)
 
     if n < 20:
         raise ValueError("Not enough data points for SATV/SPC.")
 
     # -------------------------
-    # 1. DCT smoothing (low-pass)
+    # 1. DCT split: SATV is the discarded high band
     # -------------------------
-    coeffs = dct(temps, norm="ortho")
+    coeffs = dct(temps, norm="ortho", workers=-1)
     k = int(cutoff * n)
 
-    lp = coeffs.copy()
-    lp[k:] = 0  # low-pass filter
-    smoothed = idct(lp, norm="ortho")
+    hp = coeffs.copy()
+    hp[:k] = 0  # high-pass: keep only what the low-pass drops
+    satv = idct(hp, norm="ortho", workers=-1)
 
     # -------------------------
-    # 2. Compute SATV (high-pass)
+    # 2. Smoothed signal (low-pass) = temperature - SATV
     # -------------------------
-    satv = temps - smoothed
+    smoothed = temps - satv
 
     # -------------------------
     # 3. SPC bounds computed on SATV ONLY
     # -------------------------
-    mu = np.mean(satv)
-    sigma = np.std(satv)
+    # The ortho DCT preserves energy (Parseval), so the SATV moments come
+    # from the coefficients without another pass over the series
+    mu = hp[0] / np.sqrt(n)
+    sigma = np.sqrt(max(np.dot(hp, hp) / n - mu * mu, 0.0))
     UCL = mu + std_thresh * sigma
     LCL = mu - std_thresh * sigma
 
@@ -93,7 +95,13 @@ def detect_precipitation_anomalies(df, outlier_prop=0.01):
     vals = df["precipitation"].to_numpy().reshape(-1, 1)
     n_neighbors = max(10, int(len(vals) * outlier_prop * 5))
 
-    lof = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=outlier_prop)
+    # 1-D data: kd_tree is exact and cheap to build; queries use every core
+    lof = LocalOutlierFactor(
+        n_neighbors=n_neighbors,
+        contamination=outlier_prop,
+        algorithm="kd_tree",
+        n_jobs=-1,
+    )
     preds = lof.fit_predict(vals)
     anomaly = preds == -1
 
@@ -1,9 +1,12 @@
+import re
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from statsmodels.tsa.seasonal import STL
-from scipy.signal import spectrogram
+from scipy.signal import ShortTimeFFT
 
 
 def plot_diverging_line(df, col: str):
@@ -111,6 +114,7 @@ GROUPS = {
 # ============================================================
 # Robust variable name normalizer
 # ============================================================
+@lru_cache(maxsize=None)
 def normalize_varname(name: str) -> str:
     """Normalize variable names for consistent matching."""
     return (
@@ -137,12 +141,13 @@ COLOR_MAP = {
 }
 
 
+# Single compiled pattern; the named group that matches is the COLOR_MAP key
+_COLOR_RE = re.compile("|".join(f"(?P<{key}>{key})" for key in COLOR_MAP))
+
+
 def get_color(varname: str):
-    norm = normalize_varname(varname)
-    for key, col in COLOR_MAP.items():
-        if key in norm:
-            return col
-    return "#222222"  # fallback dark gray
+    m = _COLOR_RE.search(normalize_varname(varname))
+    return COLOR_MAP[m.lastgroup] if m else "#222222"  # fallback dark gray
 
 
 # ============================================================
@@ -159,24 +164,35 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
         return fig
 
     fig = go.Figure()
+    traces = []
 
     # ------------------------------------------------------------
     # Normalize if requested
     # ------------------------------------------------------------
     if mode.startswith("Normalize") and method:
-        df_norm = df.copy()
+        # Small frame with only what gets plotted (no copy of the input)
+        df_plot = pd.DataFrame({"time": df["time"]})
         for c in cols:
-            x = df[c].astype(float)
+            x = df[c].to_numpy(dtype=float)
             if method == "Z-score":
-                df_norm[c] = (x - np.nanmean(x)) / np.nanstd(x)
+                df_plot[c] = (x - np.nanmean(x)) / np.nanstd(x)
             elif method.startswith("Min"):
-                df_norm[c] = (x - np.nanmin(x)) / (np.nanmax(x) - np.nanmin(x))
+                df_plot[c] = (x - np.nanmin(x)) / (np.nanmax(x) - np.nanmin(x))
             elif method.startswith("Index"):
-                df_norm[c] = (x / x.iloc[0]) * 100 if x.iloc[0] != 0 else x
-        df_plot = df_norm
+                df_plot[c] = (x / x[0]) * 100 if x[0] != 0 else x
+            else:
+                df_plot[c] = x
     else:
         df_plot = df
 
+    # ------------------------------------------------------------
+    # Convert once to NumPy; traces get array slices, not Series
+    # ------------------------------------------------------------
+    # (wall-clock times, as Plotly would show for a tz-aware column)
+    t = pd.DatetimeIndex(df_plot["time"]).tz_localize(None).to_numpy()
+    Y = df_plot[cols].to_numpy(dtype=float)
+    y_of = {c: Y[:, i] for i, c in enumerate(cols)}
+
     # ------------------------------------------------------------
     # Assign roles to variables
     # ------------------------------------------------------------
@@ -191,10 +207,10 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
 
         # Main line variables
         for c in main_vars:
-            fig.add_trace(
-                go.Scatter(
-                    x=df_plot["time"],
-                    y=df_plot[c],
+            traces.append(
+                go.Scattergl(
+                    x=t,
+                    y=y_of[c],
                     mode="lines",
                     name=c,
                     line=dict(
@@ -207,10 +223,10 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
 
         # Precipitation
         for c in precip_vars:
-            fig.add_trace(
+            traces.append(
                 go.Bar(
-                    x=df_plot["time"],
-                    y=df_plot[c],
+                    x=t,
+                    y=y_of[c],
                     name=c,
                     marker_color=get_color(c),
                     opacity=0.45,
@@ -220,10 +236,10 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
 
         # Wind direction
         for c in dir_vars:
-            fig.add_trace(
-                go.Scatter(
-                    x=df_plot["time"],
-                    y=df_plot[c],
+            traces.append(
+                go.Scattergl(
+                    x=t,
+                    y=y_of[c],
                     name=c,
                     mode="lines",
                     line=dict(
@@ -258,10 +274,10 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
     # ------------------------------------------------------------
     else:
         for c in cols:
-            fig.add_trace(
-                go.Scatter(
-                    x=df_plot["time"],
-                    y=df_plot[c],
+            traces.append(
+                go.Scattergl(
+                    x=t,
+                    y=y_of[c],
                     mode="lines",
                     name=c,
                     line=dict(
@@ -273,6 +289,8 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
 
         fig.update_layout(yaxis=dict(title="Normalized scale"))
 
+    fig.add_traces(traces)
+
     # ------------------------------------------------------------
     # COMMON LAYOUT
     # ------------------------------------------------------------
@@ -289,8 +307,33 @@ def plot_weather(df, cols, month_label, mode="Auto-axes", method=None):
     return fig
 
 
+# ============================================================
+# Hourly series preparation (shared by STL and spectrogram)
+# ============================================================
+def _hourly_series(df) -> pd.Series:
+    """
+    Sum duplicate hours of ``quantitykwh`` onto a regular hourly index and
+    linearly fill missing hours.
+
+    ``starttime`` is already hourly-aligned, so each row maps to an integer
+    hour offset from the first timestamp and duplicates are summed with
+    ``np.bincount`` (no hashing or sorting, unlike groupby).
+    """
+    t0 = df["starttime"].min().floor("h")
+    idx = ((df["starttime"] - t0) // pd.Timedelta(hours=1)).to_numpy(np.int64)
+    n = idx.max() + 1
+
+    weights = np.nan_to_num(df["quantitykwh"].to_numpy(np.float64))
+    y = np.bincount(idx, weights=weights, minlength=n)
+    cnt = np.bincount(idx, minlength=n)
+    y[cnt == 0] = np.nan
+
+    index = pd.date_range(t0, periods=n, freq="h")
+    return pd.Series(y, index=index, name="quantitykwh").interpolate()
+
+
 # STL decomposition plot function
-def plot_stl_decomposition(df, seasonal=30, trend=90):
+def plot_stl_decomposition(df, seasonal=7, trend=47, robust=False):
     """
     Plot STL decomposition (trend, seasonal, residual) for production data.
 
@@ -299,9 +342,14 @@ def plot_stl_decomposition(df, seasonal=30, trend=90):
     df : DataFrame
         Must contain columns ["starttime", "quantitykwh"].
     seasonal : int
-        Length of seasonal smoothing window.
+        Length of seasonal smoothing window (odd). Default 7 is the
+        recommended minimum (Cleveland et al., 1990).
     trend : int
-        Length of trend smoothing window.
+        Length of trend smoothing window (odd). Default 47 is the smallest
+        odd value >= 1.5 * period / (1 - 1.5 / seasonal) for period=24.
+    robust : bool
+        Run the outer robustness iterations. Only worth the extra LOESS
+        passes for outlier-heavy series.
 
     Returns
     -------
@@ -309,15 +357,10 @@ def plot_stl_decomposition(df, seasonal=30, trend=90):
         Interactive decomposition chart.
     """
     # --- Prepare time series (aggregate duplicates to 1-hour frequency) ---
-    ts = (
-        df.groupby("starttime", as_index=True)["quantitykwh"]
-        .sum()
-        .asfreq("h")
-        .interpolate()
-    )
+    ts = _hourly_series(df)
 
     # --- Perform STL decomposition ---
-    stl = STL(ts, seasonal=seasonal, trend=trend, robust=True)
+    stl = STL(ts, period=24, seasonal=seasonal, trend=trend, robust=robust)
     res = stl.fit()
 
     # --- Create subplots (stacked vertically) ---
@@ -329,38 +372,27 @@ def plot_stl_decomposition(df, seasonal=30, trend=90):
         vertical_spacing=0.08,
     )
 
-    # Original
-    fig.add_trace(
-        go.Scatter(
-            x=ts.index, y=ts.values, name="Original", line=dict(color="#4c78a8")
-        ),
-        row=1,
-        col=1,
-    )
-
-    # Trend
-    fig.add_trace(
-        go.Scatter(x=ts.index, y=res.trend, name="Trend", line=dict(color="#f58518")),
-        row=2,
-        col=1,
-    )
-
-    # Seasonal
-    fig.add_trace(
-        go.Scatter(
-            x=ts.index, y=res.seasonal, name="Seasonal", line=dict(color="#54a24b")
-        ),
-        row=3,
-        col=1,
-    )
-
-    # Residual
-    fig.add_trace(
-        go.Scatter(
-            x=ts.index, y=res.resid, name="Residuals", line=dict(color="#e45756")
-        ),
-        row=4,
-        col=1,
+    fig.add_traces(
+        [
+            # Original
+            go.Scatter(
+                x=ts.index, y=ts.values, name="Original", line=dict(color="#4c78a8")
+            ),
+            # Trend
+            go.Scatter(
+                x=ts.index, y=res.trend, name="Trend", line=dict(color="#f58518")
+            ),
+            # Seasonal
+            go.Scatter(
+                x=ts.index, y=res.seasonal, name="Seasonal", line=dict(color="#54a24b")
+            ),
+            # Residual
+            go.Scatter(
+                x=ts.index, y=res.resid, name="Residuals", line=dict(color="#e45756")
+            ),
+        ],
+        rows=[1, 2, 3, 4],
+        cols=[1, 1, 1, 1],
     )
 
     # --- Layout ---
@@ -377,6 +409,24 @@ def plot_stl_decomposition(df, seasonal=30, trend=90):
     return fig
 
 
+@lru_cache(maxsize=16)
+def _short_time_fft(nperseg: int, noverlap: int) -> ShortTimeFFT:
+    """
+    STFT operator equivalent to scipy.signal.spectrogram's defaults
+    (Tukey window, one-sided PSD). Cached so the window and FFT setup are
+    reused across calls with the same window/overlap.
+    """
+    return ShortTimeFFT.from_window(
+        ("tukey", 0.25),
+        fs=1.0,
+        nperseg=nperseg,
+        noverlap=noverlap,
+        fft_mode="onesided2X",
+        scale_to="psd",
+        phase_shift=None,
+    )
+
+
 # Spectrogram plot function
 def plot_spectrogram(df, window=168, overlap=50):
     """
@@ -401,18 +451,20 @@ def plot_spectrogram(df, window=168, overlap=50):
 
     # --- Prepare series ---
     # --- Prepare time series (aggregate duplicates to 1-hour frequency) ---
-    ts = (
-        df.groupby("starttime", as_index=True)["quantitykwh"]
-        .sum()
-        .asfreq("h")
-        .interpolate()
-    )
+    ts = _hourly_series(df)
     nperseg = window
     noverlap = int(window * (overlap / 100))
 
     # --- Compute spectrogram ---
-    f, t, Sxx = spectrogram(ts.values, fs=1.0, nperseg=nperseg, noverlap=noverlap)
-    Sxx_db = 10 * np.log10(Sxx + 1e-10)
+    SFT = _short_time_fft(nperseg, noverlap)
+    n = len(ts)
+    p1 = (n - noverlap) // SFT.hop
+    Sxx = SFT.spectrogram(
+        ts.values, detr="constant", p0=0, p1=p1, k_offset=nperseg // 2
+    )
+    f = SFT.f
+    t = SFT.t(n, p0=0, p1=p1, k_offset=nperseg // 2)
+    Sxx_db = (10 * np.log10(Sxx + 1e-10)).astype(np.float32)
 
     # --- Time axis mapping ---
     time_labels = pd.to_datetime(ts.index[0]) + pd.to_timedelta(t, unit="h")
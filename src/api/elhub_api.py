@@ -1,7 +1,11 @@
 import requests
+import numpy as np
 import pandas as pd
-import time
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://api.elhub.no/energy-data/v0/price-areas"
 
@@ -16,12 +20,33 @@ def _iso_cet(dt: datetime) -> str:
     if dt.tzinfo is None:
         # Auto-detect DST: EU rules → last Sunday in March/October
         # but Python handles this with zoneinfo
-        from zoneinfo import ZoneInfo
-
         dt = dt.replace(tzinfo=ZoneInfo("Europe/Oslo"))
     return dt.isoformat()
 
 
+@lru_cache(maxsize=None)
+def _get_session(max_retries: int) -> requests.Session:
+    """
+    Shared HTTP session with connection pooling and urllib3-level retries:
+    exponential backoff on connection errors, 429 and 5xx, honouring
+    Retry-After.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=8),
+    )
+    return session
+
+
 def fetch_elhub_data(
     start_time: datetime,
     end_time: datetime,
@@ -33,9 +58,10 @@ def fetch_elhub_data(
     Returns a flat DataFrame.
     """
 
-    all_records = []
+    frames = []
 
     base_url = BASE_URL
+    session = _get_session(max_retries)
 
     for area in PRICE_AREAS:
 
@@ -47,45 +73,35 @@ def fetch_elhub_data(
 
         url = f"{base_url}/{area}"
 
-        for attempt in range(max_retries):
-            try:
-                resp = requests.get(url, params=params, timeout=10)
-                status = resp.status_code
-
-                if status == 200:
-                    data = resp.json()
-                    records = _parse_elhub_response(data, area, dataset)
-                    all_records.extend(records)
-                    break
+        try:
+            resp = session.get(url, params=params, timeout=(3, 10))
+            status = resp.status_code
 
-                elif status == 204:
-                    break
+            if status == 200:
+                data = resp.json()
+                frames.append(_parse_elhub_response(data, area, dataset))
 
-                elif status == 429:
-                    wait = int(resp.headers.get("Retry-After", 5))
-                    print(f"⚠️ Rate limited for {area}. Waiting {wait}s…")
-                    time.sleep(wait)
-                    continue
+            elif status != 204:
+                print(f"⚠️ HTTP {status} for {url}")
+                print(resp.text[:200])
 
-                else:
-                    print(f"⚠️ HTTP {status} for {url}")
-                    print(resp.text[:200])
-                    break
+        except Exception as e:
+            print(f"❌ Error fetching {area}: {e}")
 
-            except Exception as e:
-                print(f"❌ Error fetching {area}: {e}")
-                time.sleep(2)
+    if not frames:
+        return pd.DataFrame()
 
-    return pd.DataFrame(all_records)
+    return pd.concat(frames, ignore_index=True)
 
 
-def _parse_elhub_response(data: dict, area: str, dataset: str):
+def _parse_elhub_response(data: dict, area: str, dataset: str) -> pd.DataFrame:
     """
     Parses Elhub JSON for both production and consumption datasets.
     Handles both 'data' and 'included' structures.
-    """
 
-    records = []
+    Entries are collected column-wise and the DataFrame is built once from
+    typed arrays (UTC timestamps, float64 kWh) instead of from row dicts.
+    """
 
     # Find correct attribute key based on dataset:
     if "CONSUMPTION" in dataset:
@@ -93,18 +109,25 @@ def _parse_elhub_response(data: dict, area: str, dataset: str):
     else:
         key = "productionPerGroupMbaHour"
 
-    # Primary structure
-    for item in data.get("data", []):
-        attrs = item.get("attributes", {})
-        for entry in attrs.get(key, []):
-            entry["priceArea"] = area
-            records.append(entry)
-
-    # Secondary structure (sometimes used)
-    for inc in data.get("included", []):
-        attrs = inc.get("attributes", {})
-        for entry in attrs.get(key, []):
-            entry["priceArea"] = area
-            records.append(entry)
-
-    return records
+    # Primary structure + secondary structure (sometimes used)
+    entries = [
+        entry
+        for section in ("data", "included")
+        for item in data.get(section, [])
+        for entry in item.get("attributes", {}).get(key, [])
+    ]
+    if not entries:
+        return pd.DataFrame()
+
+    # Union of entry fields, in order of first appearance
+    fields = dict.fromkeys(k for entry in entries for k in entry)
+    columns = {f: [entry.get(f) for entry in entries] for f in fields}
+
+    for f in ("startTime", "endTime", "lastUpdatedTime"):
+        if f in columns:
+            columns[f] = pd.to_datetime(columns[f], utc=True)
+    if "quantityKwh" in columns:
+        columns["quantityKwh"] = np.asarray(columns["quantityKwh"], dtype=np.float64)
+    columns["priceArea"] = np.full(len(entries), area, dtype=object)
+
+    return pd.DataFrame(columns)
@@ -1,6 +1,8 @@
+import numpy as np
 import openmeteo_requests
 import pandas as pd
 import requests_cache
+import streamlit as st
 from retry_requests import retry
 
 # Setup the Open-Meteo API client with cache and retries
@@ -11,12 +13,16 @@ openmeteo = openmeteo_requests.Client(session=retry_session)
 BASE_URL = "https://archive-api.open-meteo.com/v1/era5"
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_meteo_data(
     lat: float, lon: float, start_date: str, end_date: str, variables: list[str] = None
 ) -> pd.DataFrame:
     """
     Fetch ERA5 historical data for a given location and time range.
     Uses official Open-Meteo SDK with caching and retry logic.
+
+    The parsed DataFrame is cached process-wide for an hour, keyed on
+    (lat, lon, start_date, end_date, variables).
     """
     if variables is None:
         variables = ["temperature_2m", "precipitation"]
@@ -34,19 +40,19 @@ def fetch_meteo_data(
     response = responses[0]  # single location query
 
     hourly = response.Hourly()
-    data = {
-        "time": pd.date_range(
-            start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-            periods=hourly.Variables(0).ValuesAsNumpy().size,
-            freq=pd.Timedelta(seconds=hourly.Interval()),
-        )
-    }
-
-    for i, var in enumerate(variables):
-        data[var] = hourly.Variables(i).ValuesAsNumpy()
-
-    df = pd.DataFrame(data)
-    df["time"] = pd.to_datetime(df["time"]).dt.tz_convert("Europe/Oslo")
-    df = df.set_index("time")
-
-    return df
+    n = hourly.Variables(0).ValuesAsNumpy().size
+
+    # Time index built once from the SDK's start/interval scalars
+    time_index = pd.date_range(
+        start=pd.Timestamp(hourly.Time(), unit="s", tz="UTC"),
+        periods=n,
+        freq=pd.Timedelta(seconds=hourly.Interval()),
+        name="time",
+    ).tz_convert("Europe/Oslo")
+
+    # Stack all variables into one float32 buffer
+    values = np.empty((n, len(variables)), dtype=np.float32)
+    for i in range(len(variables)):
+        values[:, i] = hourly.Variables(i).ValuesAsNumpy()
+
+    return pd.DataFrame(values, columns=variables, index=time_index)
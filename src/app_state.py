@@ -4,19 +4,29 @@ Centralized application state management for the IND320 Dashboard.
 Provides initialization functions, shared state access, and weather data helpers.
 """
 
+from collections import namedtuple
+
 import streamlit as st
 import pandas as pd
-from src.db.mongo_elhub import load_production_silver, load_consumption_silver
+from src.db.mongo_elhub import (
+    load_production_silver,
+    load_consumption_silver,
+    load_production_slice,
+    load_consumption_slice,
+)
 from src.api.meteo_api import fetch_meteo_data
 
 
+# Representative city per price area; still unpacks as (city, lat, lon)
+PriceArea = namedtuple("PriceArea", "city lat lon")
+
 # Price area coordinates constant
 PRICEAREAS = {
-    "NO1": ("Oslo", 59.91, 10.75),
-    "NO2": ("Kristiansand", 58.15, 8.00),
-    "NO3": ("Trondheim", 63.43, 10.39),
-    "NO4": ("Tromsø", 69.65, 18.96),
-    "NO5": ("Bergen", 60.39, 5.32),
+    "NO1": PriceArea("Oslo", 59.91, 10.75),
+    "NO2": PriceArea("Kristiansand", 58.15, 8.00),
+    "NO3": PriceArea("Trondheim", 63.43, 10.39),
+    "NO4": PriceArea("Tromsø", 69.65, 18.96),
+    "NO5": PriceArea("Bergen", 60.39, 5.32),
 }
 
 # Default weather variables
@@ -29,41 +39,65 @@ DEFAULT_WEATHER_VARS = [
 ]
 
 
+def get_production(start=None, end=None) -> pd.DataFrame:
+    """
+    Production silver data, optionally only ``start <= starttime < end``
+    (filtered in MongoDB). The loaders are cached process-wide by
+    st.cache_resource, so this is cheap after the first call; the frame is
+    shared, so copy it before mutating.
+    Returns an empty DataFrame (and shows an error) if loading fails.
+    """
+    try:
+        if start is not None and end is not None:
+            return load_production_slice(start, end)
+        return load_production_silver()
+    except Exception as e:
+        st.error(f"Failed to load production data: {e}")
+        return pd.DataFrame()
+
+
+def get_consumption(start=None, end=None) -> pd.DataFrame:
+    """
+    Consumption silver data, optionally only ``start <= starttime < end``
+    (filtered in MongoDB). The loaders are cached process-wide by
+    st.cache_resource, so this is cheap after the first call; the frame is
+    shared, so copy it before mutating.
+    Returns an empty DataFrame (and shows an error) if loading fails.
+    """
+    try:
+        if start is not None and end is not None:
+            return load_consumption_slice(start, end)
+        return load_consumption_silver()
+    except Exception as e:
+        st.error(f"Failed to load consumption data: {e}")
+        return pd.DataFrame()
+
+
 def init_app_state():
     """
-    Initialize the application state with production and consumption data.
+    Initialize the application state and warm the data caches.
     This function should be called once from the main app.py file.
 
+    Production and consumption data are not copied into session_state;
+    pages read them through get_production() / get_consumption(), which
+    share one cached copy across all sessions.
+
     Sets the following session_state keys:
-    - production: DataFrame with production data
-    - consumption: DataFrame with consumption data
     - price_area_coords: Dictionary mapping price areas to coordinates
     """
     # Set price area coordinates in session state
     if "price_area_coords" not in st.session_state:
         st.session_state.price_area_coords = PRICEAREAS
 
-    # Load production data if not already loaded
-    if "production" not in st.session_state:
-        try:
-            st.session_state.production = load_production_silver()
-        except Exception as e:
-            st.error(f"Failed to load production data: {e}")
-            st.session_state.production = pd.DataFrame()
-
-    # Load consumption data if not already loaded
-    if "consumption" not in st.session_state:
-        try:
-            st.session_state.consumption = load_consumption_silver()
-        except Exception as e:
-            st.error(f"Failed to load consumption data: {e}")
-            st.session_state.consumption = pd.DataFrame()
+    # Warm the process-wide caches
+    get_production()
+    get_consumption()
 
 
 def get_weather(pricearea, start, end, variables=None):
     """
     Fetch weather data for a given price area and date range.
-    Results are cached in session_state using a deterministic key.
+    Results are cached process-wide by fetch_meteo_data (st.cache_data).
 
     Parameters
     ----------
@@ -88,24 +122,12 @@ def get_weather(pricearea, start, end, variables=None):
     """
     variables = variables or DEFAULT_WEATHER_VARS
 
-    # Create deterministic cache key
-    key = f"weather__{pricearea}__{start}__{end}__{'_'.join(variables)}"
-
-    # Return cached data if available
-    if key in st.session_state:
-        return st.session_state[key]
-
     # Get coordinates from session state or fallback to constant
     coords = st.session_state.get("price_area_coords") or PRICEAREAS
 
     if pricearea not in coords:
         raise ValueError(f"No coordinates for price area: {pricearea}")
 
-    city, lat, lon = coords[pricearea]
-
-    # Fetch weather data
-    df = fetch_meteo_data(lat, lon, start, end, variables=variables)
+    pa = coords[pricearea]
 
-    # Cache and return
-    st.session_state[key] = df
-    return df
+    return fetch_meteo_data(pa.lat, pa.lon, start, end, variables=variables)
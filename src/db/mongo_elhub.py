@@ -1,8 +1,17 @@
 # src/db/mongo_elhub.py
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
 import pandas as pd
 from pymongo import MongoClient
 import streamlit as st
 
+try:
+    from pymongoarrow.api import Schema, aggregate_pandas_all
+except ImportError:  # optional: fall back to the NumPy columnar build
+    aggregate_pandas_all = None
+
 
 # ---------------------------------------------------------
 # 1. Connect to MongoDB (cached)
@@ -20,47 +29,164 @@ def get_mongo_client():
 # ---------------------------------------------------------
 # 2. Load collection into Pandas
 # ---------------------------------------------------------
-def load_collection_as_df(collection_name: str) -> pd.DataFrame:
+# Silver-layer schemas: output column -> NumPy dtype of the column.
+# kWh readings are held as float32: ~7 significant digits is plenty for
+# hourly meter data, and it halves the size of the cached frames.
+PRODUCTION_FIELDS = {
+    "pricearea": object,
+    "group": object,
+    "starttime": "datetime64[ns]",
+    "quantitykwh": np.float32,
+}
+
+CONSUMPTION_FIELDS = {
+    "pricearea": object,
+    "group": object,
+    "starttime": "datetime64[ns]",
+    "endtime": "datetime64[ns]",
+    "quantitykwh": np.float32,
+}
+
+# NumPy dtype in the schemas above -> type understood by PyMongoArrow
+_ARROW_TYPES = {
+    object: str,
+    "datetime64[ns]": datetime,
+    np.float32: float,
+}
+
+# Documents per cursor round-trip / per DataFrame chunk
+_BATCH_SIZE = 10000
+
+
+def load_collection_as_df(
+    collection_name: str,
+    fields: dict,
+    rename: dict = None,
+    start: datetime = None,
+    end: datetime = None,
+) -> pd.DataFrame:
     """
-    Load an entire MongoDB collection (production_silver or consumption_silver)
-    into a Pandas DataFrame with proper timestamp conversion.
+    Load a MongoDB collection (production_silver or consumption_silver)
+    into a Pandas DataFrame, optionally only rows with
+    ``start <= starttime < end``.
+
+    The time filter, projection and renaming (``rename`` maps output
+    column -> source field) run server-side in an aggregation pipeline, so
+    only the needed fields cross the wire. Following the ``fields`` schema
+    (output column -> dtype), BSON is decoded straight into Arrow columns
+    by PyMongoArrow when it is installed, or otherwise converted batch by
+    batch into preallocated typed NumPy arrays; either way the documents
+    are never all held as dicts at once. ``starttime``/``endtime`` are
+    datetime64 (naive UTC, as pymongo returns them) on both paths.
     """
     client = get_mongo_client()
     db = client["elhub"]
     col = db[collection_name]
 
-    # Fetch all documents
-    docs = list(col.find({}))
-    if not docs:
+    # Time-range filter (served by the starttime index built at ingest)
+    match = {}
+    if start is not None:
+        match["$gte"] = pd.Timestamp(start).to_pydatetime()
+    if end is not None:
+        match["$lt"] = pd.Timestamp(end).to_pydatetime()
+    query = {"starttime": match} if match else {}
+
+    rename = rename or {}
+
+    projection = {
+        "_id": 0,
+        **{name: f"${rename[name]}" if name in rename else 1 for name in fields},
+    }
+    pipeline = [{"$project": projection}]
+    if query:
+        pipeline.insert(0, {"$match": query})
+
+    if aggregate_pandas_all is not None:
+        schema = Schema({name: _ARROW_TYPES[dtype] for name, dtype in fields.items()})
+        df = aggregate_pandas_all(col, pipeline, schema=schema, allowDiskUse=True)
+        if df.empty:
+            return pd.DataFrame()
+        return df.astype({k: v for k, v in fields.items() if v is not object})
+
+    # Preallocate columns: exact count for a slice, metadata size otherwise
+    n = col.count_documents(query) if query else col.estimated_document_count()
+    if n == 0:
         return pd.DataFrame()
 
-    # Convert to DataFrame
-    df = pd.DataFrame(docs)
+    arrays = {name: np.empty(n, dtype=dtype) for name, dtype in fields.items()}
+    columns = list(fields)
+    dtypes = {k: v for k, v in fields.items() if v is not object}
 
-    # Drop the MongoDB object ID
-    if "_id" in df.columns:
-        df = df.drop(columns=["_id"])
+    # Stream the cursor a batch at a time, converting each batch as a whole
+    # and copying it into the arrays
+    cursor = col.aggregate(pipeline, batchSize=_BATCH_SIZE, allowDiskUse=True)
+    i = 0
+    while batch := list(islice(cursor, _BATCH_SIZE)):
+        chunk = pd.DataFrame.from_records(batch, columns=columns).astype(dtypes)
+        j = i + len(chunk)
+        if j > n:
+            # The estimate was too low: grow every column
+            n = max(2 * n, j)
+            arrays = {
+                name: np.concatenate([arr[:i], np.empty(n - i, dtype=arr.dtype)])
+                for name, arr in arrays.items()
+            }
+        for name, arr in arrays.items():
+            arr[i:j] = chunk[name].to_numpy()
+        i = j
 
-    # Convert timestamps
-    for colname in ["starttime", "endtime"]:
-        if colname in df.columns:
-            df[colname] = pd.to_datetime(df[colname])
+    if i == 0:
+        return pd.DataFrame()
 
-    return df
+    # Copy when the estimate overshot, so the cached frame doesn't keep
+    # views that pin the oversized buffers
+    if i < n:
+        arrays = {name: arr[:i].copy() for name, arr in arrays.items()}
+    return pd.DataFrame(arrays)
 
 
 # ---------------------------------------------------------
 # 3. Convenience loaders
 # ---------------------------------------------------------
-@st.cache_data
+# cache_resource hands every caller the same DataFrame (no pickling or
+# copying per hit), so treat the results as read-only and copy before
+# assigning columns. Entries expire after an hour so new ingests show up,
+# and the slice caches keep only a few recent windows in memory.
+@st.cache_resource(ttl=3600, max_entries=1)
 def load_production_silver() -> pd.DataFrame:
-    df = load_collection_as_df("production_silver")
-    df = df.rename(columns={"productiongroup": "group"})
-    return df
+    """Production silver table, with float32 ``quantitykwh``."""
+    return load_collection_as_df(
+        "production_silver", PRODUCTION_FIELDS, rename={"group": "productiongroup"}
+    )
 
 
-@st.cache_data
+@st.cache_resource(ttl=3600, max_entries=1)
 def load_consumption_silver() -> pd.DataFrame:
-    df = load_collection_as_df("consumption_silver")
-    df = df.rename(columns={"consumptiongroup": "group"})
-    return df
+    """Consumption silver table, with float32 ``quantitykwh``."""
+    return load_collection_as_df(
+        "consumption_silver", CONSUMPTION_FIELDS, rename={"group": "consumptiongroup"}
+    )
+
+
+@st.cache_resource(ttl=3600, max_entries=4)
+def load_production_slice(start: datetime, end: datetime) -> pd.DataFrame:
+    """Production silver rows with ``start <= starttime < end``."""
+    return load_collection_as_df(
+        "production_silver",
+        PRODUCTION_FIELDS,
+        rename={"group": "productiongroup"},
+        start=start,
+        end=end,
+    )
+
+
+@st.cache_resource(ttl=3600, max_entries=4)
+def load_consumption_slice(start: datetime, end: datetime) -> pd.DataFrame:
+    """Consumption silver rows with ``start <= starttime < end``."""
+    return load_collection_as_df(
+        "consumption_silver",
+        CONSUMPTION_FIELDS,
+        rename={"group": "consumptiongroup"},
+        start=start,
+        end=end,
+    )
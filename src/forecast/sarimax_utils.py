@@ -1,32 +1,61 @@
+import hashlib
+
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 import streamlit as st
 
+# Two-sided 95% normal quantile, norm.ppf(0.975)
+_Z_95 = 1.959963984540054
+
+
+def _content_hash(obj) -> str:
+    """
+    Exact digest of an array / Series / DataFrame (values and index).
+
+    Unlike Streamlit's default hashing this never samples rows, so a cached
+    result is only reused when every input value is identical.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        h.update(repr(obj.shape).encode())
+        labels = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+        h.update(repr(list(labels)).encode())
+        # Row hashes cover the index and every column, whatever its dtype
+        obj = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+    h.update(np.ascontiguousarray(obj).tobytes())
+    return h.hexdigest()
+
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _content_hash})
 def prepare_data(df, target_col, start_date, end_date, exog_cols=None):
     """
     Slice and return target + exogenous. Cache because this step is pure.
+
+    ``df`` must have a sorted DatetimeIndex: the bounds are found by binary
+    search (same inclusive, partial-date semantics as ``.loc``) and the
+    slice is positional.
+
+    Returns plain NumPy arrays ``(y, X, t)``: float64 target, float64
+    exogenous matrix (or None) and the datetime64 timestamps, so the model
+    code never touches pandas; callers re-attach ``t`` only for plotting.
     """
-    df = df.copy()
-    dff = df.loc[start_date:end_date]
+    i0, i1 = df.index.slice_locs(start_date, end_date)
 
-    y = dff[target_col]
+    t = df.index.to_numpy()[i0:i1]
+    y = df[target_col].iloc[i0:i1].to_numpy(dtype=np.float64)
 
     if exog_cols:
-        X = dff[exog_cols]
+        X = df[exog_cols].iloc[i0:i1].to_numpy(dtype=np.float64)
     else:
         X = None
 
-    return y, X
+    return y, X, t
 
 
-def fit_sarimax(y, X, order, seasonal_order):
-    """
-    Model fitting cannot be cached safely because SARIMAX objects are not pickle-safe.
-    """
-    model = SARIMAX(
+def _sarimax_model(y, X, order, seasonal_order):
+    """The SARIMAX specification used for both fitting and refiltering."""
+    return SARIMAX(
         y,
         exog=X,
         order=order,
@@ -34,20 +63,77 @@ def fit_sarimax(y, X, order, seasonal_order):
         enforce_stationarity=False,
         enforce_invertibility=False,
     )
-    return model.fit(disp=False)
+
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=8,
+    hash_funcs={np.ndarray: _content_hash},
+)
+def _fit_params(y, X, order, seasonal_order):
+    """
+    Maximum-likelihood parameters for one (y, X, order, seasonal_order).
+
+    Only the small parameter vector is cached: a full SARIMAXResults keeps
+    the per-step state covariances and can run to hundreds of MB.
+    """
+    return _sarimax_model(y, X, order, seasonal_order).fit(disp=False).params
+
+
+def fit_sarimax(y, X, order, seasonal_order, backend="statsmodels"):
+    """
+    Fitted model for (y, X, order, seasonal_order, backend).
+
+    The expensive optimisation runs once per distinct input (see
+    ``_fit_params``); on later reruns the results object is rebuilt from
+    the cached parameters with a single Kalman filter pass, and freed again
+    once the page is done with it.
+
+    ``backend="statsforecast"`` fits Nixtla's numba-compiled ARIMA instead,
+    which is several times faster but only supports forecasting (no
+    in-sample prediction or summary); statsmodels stays the default.
+    """
+    if backend == "statsforecast":
+        from statsforecast.models import ARIMA
+
+        *seasonal_pdq, m = seasonal_order
+        model = ARIMA(order=order, seasonal_order=tuple(seasonal_pdq), season_length=m)
+        return model.fit(
+            np.asarray(y, dtype=np.float64),
+            X=None if X is None else np.asarray(X, dtype=np.float64),
+        )
+
+    params = _fit_params(y, X, order, seasonal_order)
+    return _sarimax_model(y, X, order, seasonal_order).filter(params)
 
 
 def run_forecast(model_params, steps, X_future):
     """
     Cache forecast results based on model parameters, steps and exog future.
     NOTE: We cache *results*, not the model object.
+
+    Returns ``(mean, lower, upper)`` as NumPy arrays (95% interval).
     """
     model, order, seasonal_order, y, X = model_params
 
+    if not hasattr(model, "get_forecast"):  # statsforecast backend
+        pred = model.predict(
+            h=steps,
+            X=None if X_future is None else np.asarray(X_future, dtype=np.float64),
+            level=[95],
+        )
+        return (
+            np.asarray(pred["mean"]),
+            np.asarray(pred["lo-95"]),
+            np.asarray(pred["hi-95"]),
+        )
+
     pred = model.get_forecast(steps=steps, exog=X_future)
-    forecast_mean = pred.predicted_mean
-    conf_int = pred.conf_int()
-    lower = conf_int.iloc[:, 0]
-    upper = conf_int.iloc[:, 1]
+    forecast_mean = np.asarray(pred.predicted_mean)
+    # 95% bounds straight from the forecast standard errors (what
+    # conf_int() computes, without building and slicing a DataFrame)
+    half_width = _Z_95 * np.asarray(pred.se_mean)
+    lower = forecast_mean - half_width
+    upper = forecast_mean + half_width
 
     return forecast_mean, lower, upper
@@ -1,7 +1,13 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from scipy.fftpack import dct, idct
+from scipy.fft import dct, idct
+
+
+def _time_sorted(df, col):
+    """Time-sorted (timestamps, float64 values) for one column, without copying df."""
+    t = pd.DatetimeIndex(pd.to_datetime(df["time"]))
+    order = np.argsort(t.asi8, kind="stable")
+    return t[order], df[col].to_numpy(dtype=np.float64)[order]
 
 
 # ======================================================
@@ -20,32 +26,32 @@ def plot_temperature_outliers(df, freq_cutoff, std_thresh):
     std_thresh : float
         Standard deviation threshold for outlier detection.
     """
-    df = df.copy()
-    df["time"] = pd.to_datetime(df["time"])
-    df = df.set_index("time").sort_index()
+    import matplotlib.pyplot as plt  # deferred: heavy, only needed when plotting
+
+    t, y = _time_sorted(df, "temperature_2m")
 
     # --- DCT filtering ---
-    y = df["temperature_2m"].values
-    y_dct = dct(y, norm="ortho")
-    y_dct[freq_cutoff:] = 0
-    y_smooth = idct(y_dct, norm="ortho")
+    # The residual is the inverse of the discarded high band
+    y_dct = dct(y, norm="ortho", workers=-1)
+    y_dct[:freq_cutoff] = 0
+    residual = idct(y_dct, norm="ortho", workers=-1)
 
-    df["filtered"] = y_smooth
-    df["residual"] = df["temperature_2m"] - df["filtered"]
+    filtered = y - residual
 
     # --- Outlier detection ---
-    std = df["residual"].std()
-    df["outlier"] = np.abs(df["residual"]) > std_thresh * std
+    # Sample std of the residual via Parseval (ortho DCT preserves energy)
+    n = len(y)
+    mean = y_dct[0] / np.sqrt(n)
+    std = np.sqrt(max((np.dot(y_dct, y_dct) - n * mean * mean) / (n - 1), 0.0))
+    outlier = np.abs(residual) > std_thresh * std
 
     # --- Plot ---
     plt.figure(figsize=(12, 5))
-    plt.plot(df.index, df["temperature_2m"], color="gray", alpha=0.6, label="Observed")
-    plt.plot(
-        df.index, df["filtered"], color="blue", linewidth=1.5, label="Filtered signal"
-    )
+    plt.plot(t, y, color="gray", alpha=0.6, label="Observed")
+    plt.plot(t, filtered, color="blue", linewidth=1.5, label="Filtered signal")
     plt.scatter(
-        df.index[df["outlier"]],
-        df.loc[df["outlier"], "temperature_2m"],
+        t[outlier],
+        y[outlier],
         color="red",
         s=25,
         label="Outliers",
@@ -62,7 +68,6 @@ def plot_temperature_outliers(df, freq_cutoff, std_thresh):
 # ======================================================
 # 2️⃣ Precipitation Anomaly Plot (LOF)
 # ======================================================
-from sklearn.neighbors import LocalOutlierFactor
 
 
 def plot_precipitation_anomalies(df, contamination=0.01):
@@ -76,23 +81,23 @@ def plot_precipitation_anomalies(df, contamination=0.01):
     contamination : float
         Proportion of points to mark as anomalies.
     """
-    df = df.copy()
-    df["time"] = pd.to_datetime(df["time"])
-    df = df.set_index("time").sort_index()
+    import matplotlib.pyplot as plt  # deferred: heavy, only needed when plotting
+    from sklearn.neighbors import LocalOutlierFactor
+
+    t, precip = _time_sorted(df, "precipitation")
 
     # --- LOF detection ---
-    lof = LocalOutlierFactor(contamination=contamination)
-    preds = lof.fit_predict(df[["precipitation"]])
-    df["anomaly"] = preds == -1
+    lof = LocalOutlierFactor(
+        contamination=contamination, algorithm="kd_tree", n_jobs=-1
+    )
+    anomaly = lof.fit_predict(precip.reshape(-1, 1)) == -1
 
     # --- Plot ---
     plt.figure(figsize=(12, 5))
-    plt.plot(
-        df.index, df["precipitation"], color="blue", linewidth=1, label="Precipitation"
-    )
+    plt.plot(t, precip, color="blue", linewidth=1, label="Precipitation")
     plt.scatter(
-        df.index[df["anomaly"]],
-        df.loc[df["anomaly"], "precipitation"],
+        t[anomaly],
+        precip[anomaly],
         color="red",
         s=25,
         label="Anomalies",
@@ -1,51 +1,75 @@
+from functools import lru_cache
+
 import streamlit as st
+from streamlit import session_state as _ss
+from streamlit import sidebar as _sb
+
+from src.app_state import PRICEAREAS
+
+# Option sequences are module-level tuples: built once per process and
+# passed to the widgets as the same immutable objects on every rerun
+AVAILABLE_YEARS = (2018, 2019, 2020, 2021, 2022, 2023, 2024)
+AVAILABLE_MONTHS = ("ALL", *(f"{i:02d}" for i in range(1, 13)))
+_PRICE_AREA_KEYS = tuple(PRICEAREAS)
+
+# Initial selection for a new session
+_DEFAULTS = {"price_area": "NO1", "year": 2021, "month_sel": "01"}
+
+
+def _fmt_month(x):
+    """Label for the month options."""
+    return "All months" if x == "ALL" else x
+
+
+@lru_cache(maxsize=32)
+def _resolve(price_area, year, month):
+    """
+    The tuple sidebar_controls returns for one selection. Memoized, so an
+    unchanged selection yields the very same object on every rerun.
+    """
+    pa = PRICEAREAS[price_area]
+    return price_area, pa.city, pa.lat, pa.lon, year, month
 
 
 def sidebar_controls():
     """Shared sidebar that persists across pages within the same session."""
-    st.sidebar.header("Select Location and Period")
+    _sb.header("Select Location and Period")
+
+    # --- Step 1: Prepopulate Streamlit session_state if empty ---
+    # One lookup per rerun. Guarded on a widget key rather than a separate
+    # flag: Streamlit drops these keys after a page that doesn't render the
+    # sidebar, and they must then be seeded again.
+    if "price_area" not in _ss:
+        _ss.update(_DEFAULTS)
 
-    PRICE_AREA_COORDS = {
-        "NO1": ("Oslo", 59.91, 10.75),
-        "NO2": ("Kristiansand", 58.15, 8.00),
-        "NO3": ("Trondheim", 63.43, 10.39),
-        "NO4": ("Tromsø", 69.65, 18.96),
-        "NO5": ("Bergen", 60.39, 5.32),
-    }
+    # --- Step 2: Widgets restore their value from state through `key` ---
+    # Inside a form, changes are buffered in the browser and applied in a
+    # single rerun on "Apply" instead of one full rerun per widget.
+    with _sb.form("period_form"):
+        # Short option lists render as radio groups (lighter than a
+        # selectbox popover); the longer year list stays a selectbox
+        price_area = st.radio(
+            "Select Price Area",
+            options=_PRICE_AREA_KEYS,
+            key="price_area",
+            horizontal=True,
+        )
 
-    years = [2018, 2019, 2020, 2021, 2022, 2023, 2024]
-    months = ["ALL"] + [f"{i:02d}" for i in range(1, 13)]
+        year = st.selectbox(
+            "Select Year",
+            options=AVAILABLE_YEARS,
+            key="year",
+        )
 
-    # --- Step 1: Prepopulate Streamlit session_state if empty ---
-    # (Only the first time in an app session)
-    if not all(k in st.session_state for k in ["price_area", "year", "month_sel"]):
-        st.session_state["price_area"] = "NO1"
-        st.session_state["year"] = 2021
-        st.session_state["month_sel"] = "01"
-
-    # --- Step 2: Widgets use the current state values ---
-    price_area = st.sidebar.selectbox(
-        "Select Price Area",
-        options=list(PRICE_AREA_COORDS.keys()),
-        index=list(PRICE_AREA_COORDS.keys()).index(st.session_state["price_area"]),
-        key="price_area",
-    )
-    city, lat, lon = PRICE_AREA_COORDS[price_area]
-
-    year = st.sidebar.selectbox(
-        "Select Year",
-        options=years,
-        index=years.index(st.session_state["year"]),
-        key="year",
-    )
-
-    month = st.sidebar.selectbox(
-        "Select Month",
-        options=months,
-        index=months.index(st.session_state["month_sel"]),
-        key="month_sel",
-        format_func=lambda x: "All months" if x == "ALL" else x,
-    )
+        month = st.radio(
+            "Select Month",
+            options=AVAILABLE_MONTHS,
+            key="month_sel",
+            format_func=_fmt_month,
+            horizontal=True,
+        )
+
+        st.form_submit_button("Apply")
 
     # --- Step 3: Return consistent values ---
-    return price_area, city, lat, lon, year, month
+    return _resolve(price_area, year, month)